@@ -1,26 +1,39 @@
 import boto3
+from botocore.config import Config
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
 from dotenv import load_dotenv
 import re
 import pystac
+from pystac.stac_io import DefaultStacIO
+import orjson
 from pathlib import Path
 import shutil
 import json
+import io
 import os
 from datetime import datetime, timedelta, timezone
 from typing import List, Iterator, Optional, Tuple, Dict
 import shapely
 from shapely.geometry import shape, box
-import shapely.ops
 import rasterio
 from rasterio.session import AWSSession
 import rasterio.warp
+import tifffile
 import fsspec
 import h5py
+import diskcache
 import sys
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+import functools
 import numpy as np
 import pyproj
-from mypy_boto3_s3.service_resource import Object, ObjectSummary
+from pyproj.exceptions import CRSError, ProjError
+from mypy_boto3_s3.client import S3Client
+from mypy_boto3_s3.type_defs import ObjectTypeDef
 import logging
 
 
@@ -39,9 +52,9 @@ logger.addHandler(file_handler)
 
 load_dotenv()
 
-s3 = boto3.resource('s3')
 BUCKET_NAME = 'kanawha-pilot'
-BUCKET = s3.Bucket(BUCKET_NAME)
+RAS_MODELS_PREFIX = "FFRD_Kanawha_Compute/ras/"
+RUNS_PREFIX = "FFRD_Kanawha_Compute/runs/"
 
 CATALOG_TIMESTAMP = datetime.now().strftime('%Y%m%d-%H%M')
 ROOT_HREF = f"./stac/kanawha-models-{CATALOG_TIMESTAMP}"
@@ -55,7 +68,120 @@ SIMULATIONS = 1001 + 1
 # SIMULATIONS = 10
 # DEPTH_GRIDS = 10
 
-AWS_SESSION = AWSSession(boto3.Session())
+# results of expensive per-object reads, keyed on S3 ETag so reruns skip unchanged objects.
+# Bump CACHE_VERSION whenever the output of a cached function (or the attribute/bounds
+# conversion it relies on) changes; entries from older versions are then ignored.
+CACHE_VERSION = 1
+CACHE_DIR = './.stac-cache'
+CACHE = diskcache.Cache(CACHE_DIR)
+
+MAX_WORKERS = 16
+# h5py holds one global lock for every call (including the fsspec reads beneath it),
+# so HDF5 attribute reads run in worker processes rather than in the model threads
+HDF_WORKERS = 16
+RASTER_WORKERS = 32
+# one raster pool shared by all model threads, so thread counts add rather than multiply
+# and each raster thread only builds its AWSSession once
+RASTER_EXECUTOR = ThreadPoolExecutor(max_workers=RASTER_WORKERS)
+CHECK_NULL_RASTERS = False
+
+LIST_PAGE_SIZE = 1000
+
+# the default pool of 10 connections would throttle the model and raster thread pools
+S3_MAX_POOL_CONNECTIONS = 64
+S3_RETRIES = {'mode': 'adaptive', 'max_attempts': 10}
+S3_CONFIG = Config(max_pool_connections=S3_MAX_POOL_CONNECTIONS, retries=S3_RETRIES)
+
+# boto3 clients are thread-safe, so one pooled client is shared by every worker
+_S3_CLIENT: S3Client = boto3.session.Session().client('s3', config=S3_CONFIG)
+
+# boto3 sessions are not thread-safe, so each worker thread gets its own for rasterio
+_thread_local = threading.local()
+
+
+def get_s3_client() -> S3Client:
+    return _S3_CLIENT
+
+
+def get_aws_session() -> AWSSession:
+    aws_session = getattr(_thread_local, 'aws_session', None)
+    if aws_session is None:
+        aws_session = AWSSession(boto3.session.Session())
+        _thread_local.aws_session = aws_session
+    return aws_session
+
+
+# set by main() for the duration of a catalog build; None means read in-process
+_hdf_executor: Optional[ProcessPoolExecutor] = None
+
+
+def read_hdf(func, *args, **kwargs):
+    """
+    Run an HDF5 reading function in the HDF5 process pool, if one is running.
+    """
+    if _hdf_executor is None:
+        return func(*args, **kwargs)
+    return _hdf_executor.submit(func, *args, **kwargs).result()
+
+
+_CACHE_MISS = object()
+
+
+def etag_cached(func):
+    """
+    Cache a function of an S3 key on disk, keyed on the key and its current ETag.
+    Callers that already have the ETag from a listing can pass `e_tag=` to avoid a HEAD request.
+    """
+    @functools.wraps(func)
+    def wrapper(s3_key: str, *args, e_tag: Optional[str] = None, **kwargs):
+        if e_tag is None:
+            e_tag = get_s3_client().head_object(Bucket=BUCKET_NAME, Key=s3_key)['ETag']
+        cache_key = (CACHE_VERSION, func.__name__, s3_key, e_tag, args, tuple(sorted(kwargs.items())))
+        value = CACHE.get(cache_key, default=_CACHE_MISS)
+        if value is _CACHE_MISS:
+            value = func(s3_key, *args, **kwargs)
+            CACHE.set(cache_key, value)
+        return value
+    return wrapper
+
+
+@dataclass
+class S3Object:
+    key: str
+    size: int
+    e_tag: str
+    last_modified: datetime
+    storage_class: str
+    # key decomposition, computed once per object rather than in every loop that needs it
+    parts: Tuple[str, ...] = field(init=False, repr=False)
+    basename: str = field(init=False, repr=False)
+    ext: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.parts = tuple(self.key.split('/'))
+        self.basename = self.parts[-1]
+        _, _, self.ext = self.basename.partition('.')
+
+    @classmethod
+    def from_listing(cls, obj: ObjectTypeDef) -> "S3Object":
+        return cls(
+            key=obj['Key'],
+            size=obj['Size'],
+            e_tag=obj['ETag'],
+            last_modified=obj['LastModified'],
+            storage_class=obj.get('StorageClass', 'STANDARD'),
+        )
+
+
+class SortedOrjsonStacIO(DefaultStacIO):
+    """
+    Serializes STAC objects with orjson, sorting keys as they're written
+    rather than re-sorting every asset's extra fields while building the catalog.
+    """
+
+    def json_dumps(self, json_dict: dict, *args, **kwargs) -> str:
+        option = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(json_dict, option=option).decode('utf-8')
 
 
 def create_catalog():
@@ -118,22 +244,30 @@ def obj_key_to_s3_url(obj_key: str) -> str:
     return f"s3://{BUCKET_NAME}/{obj_key}"
 
 
-def get_ras_file_roles(filename: str) -> Optional[List[str]]:
-    ext = ".".join(filename.split('.')[1:])
-    ras_roles = {
-        "g01": ["ras-geometry-text"],
-        "g01.hdf": ["ras-geometry"],
-        "p01": ["ras-plan"],
-        "p01.hdf": ["ras-output"],
-        "u01": ["ras-unsteady"],
-        "prj": ["ras-project"],
-    }
-    return ras_roles.get(ext, None)
+RAS_FILE_ROLES = {
+    "g01": ["ras-geometry-text"],
+    "g01.hdf": ["ras-geometry"],
+    "p01": ["ras-plan"],
+    "p01.hdf": ["ras-output"],
+    "u01": ["ras-unsteady"],
+    "prj": ["ras-project"],
+}
+
+RAS_TEXT_FILE_EXTENSIONS = frozenset(['b01', 'bco01', 'g01', 'p01', 'u01', 'x01', 'prj'])
+
 
+def get_ras_file_roles(ext: str) -> Optional[List[str]]:
+    roles = RAS_FILE_ROLES.get(ext, None)
+    return list(roles) if roles is not None else None
 
-def create_ras_model_collection(key_base: str):
+
+def create_ras_model_collection(key_base: str) -> Tuple[pystac.Collection, Optional[shapely.Polygon]]:
+    """
+    Create the collection for a RAS model. Also returns the 2D flow area perimeter,
+    read from the same .g01.hdf handle as the geometry attributes.
+    """
     logger.info(f"Creating RAS model collection: {key_base}")
-    model_objs = BUCKET.objects.filter(Prefix=key_base)
+    model_objs = filter_objects(prefix=key_base)
     basename = os.path.basename(key_base)
     collection = pystac.Collection(
         id=f"{RAS_MODELS_COLLECTION_ID}-{basename}",
@@ -143,15 +277,16 @@ def create_ras_model_collection(key_base: str):
     )
     collection.ext.add("proj")
     collection.ext.add("file")
+    perimeter = None
     for obj in model_objs:
-        filename = os.path.basename(obj.key)
+        filename = obj.basename
         asset = pystac.Asset(
             href=obj_key_to_s3_url(obj.key),
             title=filename,
         )
-        asset.roles = get_ras_file_roles(filename)
+        asset.roles = get_ras_file_roles(obj.ext)
         if filename.endswith('.g01.hdf'):
-            geom_attrs = get_geom_attrs(obj.key)
+            geom_attrs, perimeter = read_hdf(get_geom_attrs_and_perimeter, obj.key, e_tag=obj.e_tag)
             asset.extra_fields = geom_attrs
             geom_extents = ras_geom_extents(geom_attrs['geometry:extents'], geom_attrs['proj:wkt2'])
             spatial_extent = pystac.SpatialExtent([geom_extents.bounds])
@@ -159,17 +294,16 @@ def create_ras_model_collection(key_base: str):
             collection.extent = pystac.Extent(spatial=spatial_extent, temporal=temporal_extent)
             asset.media_type = pystac.MediaType.HDF5
         elif filename.endswith('.p01.hdf'):
-            plan_attrs = get_plan_attrs(obj.key, results=False)
+            plan_attrs = read_hdf(get_plan_attrs, obj.key, results=False, e_tag=obj.e_tag)
             asset.extra_fields = plan_attrs
             asset.media_type = pystac.MediaType.HDF5
         elif filename.endswith('.hdf'):
             asset.media_type = pystac.MediaType.HDF5
-        elif filename.split('.')[-1] in ['b01', 'bco01', 'g01', 'p01', 'u01', 'x01', 'prj']:
+        elif filename.rpartition('.')[2] in RAS_TEXT_FILE_EXTENSIONS:
             asset.media_type = pystac.MediaType.TEXT
         asset.extra_fields.update(get_basic_object_metadata(obj))
-        asset.extra_fields = dict(sorted(asset.extra_fields.items()))
         collection.add_asset(key=filename, asset=asset)
-    return collection
+    return collection, perimeter
 
 
 def create_ras_model_realization_collection(key_base: str, r: int):
@@ -184,18 +318,15 @@ def create_ras_model_realization_collection(key_base: str, r: int):
     return collection
 
 
-def get_ras_output_assets(key_base: str, r: int, s: int) -> List[pystac.Asset]:
+def get_ras_output_assets(key_base: str, r: int, s: int, known_results: Optional[Dict[str, dict]] = None) -> List[pystac.Asset]:
     logger.info(f"Getting RAS output assets: {r} {s} {key_base}")
     basename = os.path.basename(key_base)
-    ras_output_objs = filter_objects(
-        pattern=rf"^FFRD_Kanawha_Compute\/runs\/{s}\/ras\/{basename}\/.*$",
-        prefix=f"FFRD_Kanawha_Compute/runs/{s}/ras/{basename}"
-    )
+    ras_output_objs = run_objects_for_model(s, basename, 'ras')
     assets = []
     for obj in ras_output_objs:
         # print(obj.key)
-        filename = os.path.basename(obj.key)
-        s = int(obj.key.split('/')[-4])
+        filename = obj.basename
+        s = int(obj.parts[-4])
         simulation = get_simulation_string(s)
         realization = get_realization_string(r)
         simulation_filename = f"{realization}-{simulation}_{filename}"
@@ -204,8 +335,10 @@ def get_ras_output_assets(key_base: str, r: int, s: int) -> List[pystac.Asset]:
             title=simulation_filename,
         )
         if obj.key.endswith('.p01.hdf'):
-            results_attrs = get_plan_results_attrs(obj.key)
-            asset.extra_fields = results_attrs
+            results_attrs = (known_results or {}).get(obj.key)
+            if results_attrs is None:
+                results_attrs = read_hdf(get_plan_results_attrs, obj.key, e_tag=obj.e_tag)
+            asset.extra_fields = dict(results_attrs)
             asset.roles = ['ras-output']
             asset.media_type = pystac.MediaType.HDF5
             asset.title = f"{realization}-{simulation}-{filename}"
@@ -216,26 +349,28 @@ def get_ras_output_assets(key_base: str, r: int, s: int) -> List[pystac.Asset]:
         asset.extra_fields['cloud_wat:realization'] = r
         asset.extra_fields['cloud_wat:simulation'] = s
         asset.extra_fields.update(get_basic_object_metadata(obj))
-        asset.extra_fields = dict(sorted(asset.extra_fields.items()))
         assets.append(asset)
     return assets
 
 
-def get_ras_realization_metadata(key_base: str, r: int, s: int = 1) -> dict:
+def get_ras_realization_metadata(key_base: str, r: int, s: int = 1) -> Tuple[dict, Dict[str, dict]]:
+    """
+    Realization properties from the plan attributes of simulation `s`. Its results
+    attributes come from the same read and are returned keyed by S3 key, so the
+    output asset for that simulation doesn't read the file again.
+    """
     logger.info(f"Getting RAS output metadata for realization: {r} {key_base} (s={s})")
     basename = os.path.basename(key_base)
-    ras_output_objs = filter_objects(
-        pattern=rf"^FFRD_Kanawha_Compute\/runs\/{s}\/ras\/{basename}\/.*\.p01.hdf$",
-        prefix=f"FFRD_Kanawha_Compute/runs/{s}/ras/{basename}",
-    )
+    ras_output_objs = run_objects_for_model(s, basename, 'ras', suffix=".p01.hdf")
     plan_attrs = {
         'cloud_wat:realization': r,
     }
     for obj in ras_output_objs:
         if obj.key.endswith(".p01.hdf"):
-            plan_attrs.update(get_plan_attrs(obj.key, results=False))
-            return plan_attrs
-    return plan_attrs
+            run_plan_attrs, results_attrs = read_hdf(get_plan_and_results_attrs, obj.key, e_tag=obj.e_tag)
+            plan_attrs.update(run_plan_attrs)
+            return plan_attrs, {obj.key: results_attrs}
+    return plan_attrs, {}
 
 
 def asset_field_values(assets: List[pystac.Asset], field: str, media_type: pystac.MediaType = pystac.MediaType.HDF5) -> list:
@@ -271,13 +406,14 @@ def get_ras_simulation_stats(assets: List[pystac.Asset]) -> dict:
     return stats
 
 
-def create_realization_ras_results_item(key_base: str, r: int):
+def create_realization_ras_results_item(key_base: str, r: int, geometry: Optional[shapely.Polygon] = None):
     logger.info(f"Creating realization RAS results item: {key_base}, {r}")
     basename = os.path.basename(key_base)
     realization = f"r{str(r).zfill(4)}"
-    geometry = get_2d_flow_area_perimeter(key_base + '.g01.hdf')
+    if geometry is None:
+        geometry = read_hdf(get_2d_flow_area_perimeter, key_base + '.g01.hdf')
     bbox = geometry.bounds
-    properties = get_ras_realization_metadata(key_base, r)
+    properties, known_results = get_ras_realization_metadata(key_base, r)
     item = pystac.Item(
         id=f"{basename}-{realization}",
         properties=properties,
@@ -287,7 +423,7 @@ def create_realization_ras_results_item(key_base: str, r: int):
     )
     item.ext.add("proj")
     for s in range(1, SIMULATIONS):
-        assets = get_ras_output_assets(key_base, r, s)
+        assets = get_ras_output_assets(key_base, r, s, known_results)
         for asset in assets:
             item.add_asset(key=asset.title, asset=asset)
     item.properties.update(get_ras_simulation_stats(item.assets.values()))
@@ -296,19 +432,16 @@ def create_realization_ras_results_item(key_base: str, r: int):
 
 def depth_grids_for_model_run(key_base: str, s: int):
     basename = os.path.basename(key_base)
-    return filter_objects(
-        pattern=rf"^FFRD_Kanawha_Compute\/runs\/{s}\/depth-grids\/{basename}\/.*\.tif$",
-        prefix=f"FFRD_Kanawha_Compute/runs/{s}/depth-grids/{basename}"
-    )
+    return run_objects_for_model(s, basename, 'depth-grids', suffix=".tif")
 
 
-def get_basic_object_metadata(obj: ObjectSummary) -> dict:
+def get_basic_object_metadata(obj: S3Object) -> dict:
     return {
         'file:size': obj.size,
         'e_tag': obj.e_tag,
         'last_modified': obj.last_modified.isoformat(),
         'storage:platform': 'AWS',
-        'storage:region': obj.meta.client.meta.region_name,
+        'storage:region': get_s3_client().meta.region_name,
         'storage:tier': obj.storage_class,
     }
 
@@ -316,49 +449,72 @@ def get_basic_object_metadata(obj: ObjectSummary) -> dict:
 def gather_depth_grid_items(key_base: str, r: int):
     basename = os.path.basename(key_base)
     realization = f"r{str(r).zfill(4)}"
-    depth_grid_items: Dict[str, pystac.Item] = {}
-    raster_bounds = {}
+
+    depth_grids: List[Tuple[int, S3Object]] = []
     for s in range(1, SIMULATIONS):
         simulation = get_simulation_string(s)
         logger.info(f"Gathering depth grid items for {simulation}, {basename}")
-        depth_grids = depth_grids_for_model_run(key_base, s)
-        # for depth_grid in depth_grids[:DEPTH_GRIDS]:
-        for depth_grid in depth_grids:
-            filename = os.path.basename(depth_grid.key)
-            if not filename in depth_grid_items.keys():
-                if not filename in raster_bounds:
-                    bbox = get_raster_bounds(depth_grid.key)
-                    raster_bounds[filename] = bbox
-                else:
-                    bbox = raster_bounds[filename]
-                geometry = bbox_to_polygon(bbox)
-                depth_grid_items[filename] = pystac.Item(
-                    id=f"{basename}-{realization}-{filename}",
-                    # title=f"{basename}-{realization}-{filename}"
-                    properties={},
-                    bbox=bbox,
-                    datetime=datetime.now(),
-                    geometry=json.loads(shapely.to_geojson(geometry)),
-                )
-            # non_null = not raster_is_all_null(depth_grid.key)
-            dg_asset = pystac.Asset(
-                href=obj_key_to_s3_url(depth_grid.key),
-                title=f"{realization}-{simulation}-{basename}-{filename}",
-                media_type=pystac.MediaType.GEOTIFF,
-                roles=['ras-depth-grid'],
-                extra_fields={
-                    'cloud_wat:realization': r,
-                    'cloud_wat:simulation': s,
-                    # 'non_null': non_null,
-                },
-            )
-            dg_asset.extra_fields.update(get_basic_object_metadata(depth_grid))
-            dg_asset.extra_fields = dict(sorted(dg_asset.extra_fields.items()))
-            # dg_metadata = get_raster_metadata(depth_grid.key)
-            # if dg_metadata:
-            #     dg_asset.extra_fields.update(dg_metadata)
-            depth_grid_items[filename].add_asset(key=dg_asset.title, asset=dg_asset)
-            depth_grid_items[filename].datetime = get_datetime_from_item_assets(depth_grid_items[filename])
+        # for depth_grid in depth_grids_for_model_run(key_base, s)[:DEPTH_GRIDS]:
+        for depth_grid in depth_grids_for_model_run(key_base, s):
+            depth_grids.append((s, depth_grid))
+
+    # bounds are only needed once per filename; null checks are needed for every grid
+    first_objs: Dict[str, S3Object] = {}
+    for _, depth_grid in depth_grids:
+        first_objs.setdefault(depth_grid.basename, depth_grid)
+
+    logger.info(f"Reading bounds of {len(first_objs)} depth grids for {basename}")
+    bounds = RASTER_EXECUTOR.map(lambda obj: get_raster_bounds(obj.key, e_tag=obj.e_tag), first_objs.values())
+    raster_bounds = dict(zip(first_objs.keys(), bounds))
+
+    non_nulls: Dict[str, bool] = {}
+    if CHECK_NULL_RASTERS:
+        logger.info(f"Checking {len(depth_grids)} depth grids for null rasters for {basename}")
+        objs = [depth_grid for _, depth_grid in depth_grids]
+        all_nulls = RASTER_EXECUTOR.map(lambda obj: raster_is_all_null(obj.key, e_tag=obj.e_tag), objs)
+        non_nulls = {obj.key: not all_null for obj, all_null in zip(objs, all_nulls)}
+
+    assets_by_filename: Dict[str, Dict[str, pystac.Asset]] = defaultdict(dict)
+    latest_modified: Dict[str, datetime] = {}
+    for s, depth_grid in depth_grids:
+        simulation = get_simulation_string(s)
+        filename = depth_grid.basename
+        dg_asset = pystac.Asset(
+            href=obj_key_to_s3_url(depth_grid.key),
+            title=f"{realization}-{simulation}-{basename}-{filename}",
+            media_type=pystac.MediaType.GEOTIFF,
+            roles=['ras-depth-grid'],
+            extra_fields={
+                'cloud_wat:realization': r,
+                'cloud_wat:simulation': s,
+            },
+        )
+        non_null = non_nulls.get(depth_grid.key)
+        if non_null is not None:
+            dg_asset.extra_fields['non_null'] = non_null
+        dg_asset.extra_fields.update(get_basic_object_metadata(depth_grid))
+        # dg_metadata = get_raster_metadata(depth_grid.key)
+        # if dg_metadata:
+        #     dg_asset.extra_fields.update(dg_metadata)
+        assets_by_filename[filename][dg_asset.title] = dg_asset
+        if filename not in latest_modified or depth_grid.last_modified > latest_modified[filename]:
+            latest_modified[filename] = depth_grid.last_modified
+
+    # build each item once, with all of its assets and its final datetime
+    depth_grid_items: Dict[str, pystac.Item] = {}
+    for filename, assets in assets_by_filename.items():
+        bbox = raster_bounds[filename]
+        geometry = bbox_to_polygon(bbox)
+        depth_grid_items[filename] = pystac.Item(
+            id=f"{basename}-{realization}-{filename}",
+            # title=f"{basename}-{realization}-{filename}"
+            properties={},
+            bbox=bbox,
+            # item datetime is the latest asset modification
+            datetime=latest_modified[filename],
+            geometry=json.loads(shapely.to_geojson(geometry)),
+            assets=assets,
+        )
     return depth_grid_items.values()
 
 
@@ -389,29 +545,141 @@ def create_depth_grids_collection(key_base: str, r: int):
     return collection
 
 
-def filter_objects(pattern: str = None, prefix: str = None) -> List[Object]:
-    compiled_pattern = re.compile(pattern) if pattern else None
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def filter_objects(pattern: str = None, prefix: str = None, suffix: str = None) -> List[S3Object]:
+    compiled_pattern = _compile_pattern(pattern) if pattern else None
+    paginator = get_s3_client().get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=BUCKET_NAME,
+        Prefix=prefix or "",
+        PaginationConfig={'PageSize': LIST_PAGE_SIZE},
+    )
     objects = []
-    for obj in BUCKET.objects.filter(Prefix=prefix):
-        if compiled_pattern:
-            if re.match(compiled_pattern, obj.key):
-                objects.append(obj)
-        else:
-            objects.append(obj)
+    for page in pages:
+        for obj in page.get('Contents', []):
+            key = obj['Key']
+            if suffix and not key.endswith(suffix):
+                continue
+            if compiled_pattern and not compiled_pattern.match(key):
+                continue
+            objects.append(S3Object.from_listing(obj))
     return objects
 
 
+@functools.lru_cache(maxsize=None)
+def _list_run_keys(s: int) -> Dict[str, List[S3Object]]:
+    logger.info(f"Listing objects for simulation run {s}")
+    run_objs = defaultdict(list)
+    for obj in filter_objects(prefix=f"{RUNS_PREFIX}{s}/"):
+        # FFRD_Kanawha_Compute/runs/{s}/{ras|depth-grids}/{basename}/...
+        if len(obj.parts) > 5:
+            run_objs[obj.parts[4]].append(obj)
+    return dict(run_objs)
+
+
+# one lock per simulation so concurrent model threads don't list the same run twice
+_run_keys_locks: Dict[int, threading.Lock] = defaultdict(threading.Lock)
+_run_keys_locks_guard = threading.Lock()
+
+
+def list_run_keys(s: int) -> Dict[str, List[S3Object]]:
+    """
+    List every object under a simulation run once, grouped by RAS model basename.
+    Results are cached so each run prefix is only listed once for all models.
+    """
+    with _run_keys_locks_guard:
+        lock = _run_keys_locks[s]
+    with lock:
+        return _list_run_keys(s)
+
+
+def run_objects_for_model(s: int, basename: str, kind: str, suffix: str = None) -> List[S3Object]:
+    objs = list_run_keys(s).get(basename, [])
+    return [
+        obj for obj in objs
+        if obj.parts[3] == kind and (not suffix or obj.key.endswith(suffix))
+    ]
+
+
 def list_ras_model_names():
-    prefix = "FFRD_Kanawha_Compute/ras"
-    plan_hdfs_pattern = r".*\.p01\.hdf$"
-    ras_plan_hdfs = list(filter_objects(plan_hdfs_pattern, prefix))
+    ras_plan_hdfs = filter_objects(prefix=RAS_MODELS_PREFIX, suffix=".p01.hdf")
     return [hdf.key[:-8] for hdf in ras_plan_hdfs]
 
 
+TIFF_HEADER_BYTES = 64 * 1024
+
+# GeoTIFF key values (see the GeoTIFF spec, section 6.3)
+GT_RASTER_PIXEL_IS_POINT = 2
+GT_USER_DEFINED = 32767
+
+
+@functools.lru_cache(maxsize=8)
+def get_epsg_4326_transformer(epsg: int) -> pyproj.Transformer:
+    return pyproj.Transformer.from_crs(epsg, 4326, always_xy=True)
+
+
+def fast_raster_bounds(s3_key: str) -> Optional[tuple]:
+    """
+    Compute EPSG:4326 bounds of a tiled GeoTIFF from a single range request over its header.
+    Returns None if the header can't be interpreted, in which case the caller should
+    fall back to opening the raster with rasterio.
+    """
+    response = get_s3_client().get_object(
+        Bucket=BUCKET_NAME,
+        Key=s3_key,
+        Range=f"bytes=0-{TIFF_HEADER_BYTES - 1}",
+    )
+    header = response['Body'].read()
+    try:
+        with tifffile.TiffFile(io.BytesIO(header)) as tif:
+            if tif.is_bigtiff:
+                return None
+            page = tif.pages[0]
+            if not page.is_tiled:
+                return None
+            tags = page.tags
+            tiepoint = tags['ModelTiepointTag'].value
+            scale_x, scale_y = tags['ModelPixelScaleTag'].value[:2]
+            width = tags['ImageWidth'].value
+            height = tags['ImageLength'].value
+            geokeys = tif.geotiff_metadata or {}
+    except Exception as e:
+        logger.debug(f"Unable to read GeoTIFF header for {s3_key}: {e}")
+        return None
+
+    epsg = geokeys.get('ProjectedCSTypeGeoKey') or geokeys.get('GeographicTypeGeoKey')
+    if epsg is None or int(epsg) == GT_USER_DEFINED:
+        return None
+
+    tie_i, tie_j, _, tie_x, tie_y = tiepoint[:5]
+    left = tie_x - tie_i * scale_x
+    top = tie_y + tie_j * scale_y
+    if int(geokeys.get('GTRasterTypeGeoKey', 1)) == GT_RASTER_PIXEL_IS_POINT:
+        left -= scale_x / 2
+        top += scale_y / 2
+    right = left + width * scale_x
+    bottom = top - height * scale_y
+
+    try:
+        transformer = get_epsg_4326_transformer(int(epsg))
+        return transformer.transform_bounds(left, bottom, right, top, densify_pts=21)
+    except (CRSError, ProjError) as e:
+        logger.debug(f"Unable to reproject GeoTIFF header bounds for {s3_key}: {e}")
+        return None
+
+
+@etag_cached
 def get_raster_bounds(s3_key: str):
     # print(f"getting raster bounds: {s3_key}")
+    bounds_4326 = fast_raster_bounds(s3_key)
+    if bounds_4326 is not None:
+        return bounds_4326
     s3_path = f"s3://{BUCKET_NAME}/{s3_key}"
-    with rasterio.Env(AWS_SESSION):
+    with rasterio.Env(get_aws_session()):
         with rasterio.open(s3_path) as src:
             bounds = src.bounds
             crs = src.crs
@@ -419,6 +687,69 @@ def get_raster_bounds(s3_key: str):
             return bounds_4326
 
 
+def _any_non_null(arr: np.ndarray, nodata: float) -> bool:
+    # exits on the first valid cell instead of materializing a boolean mask
+    for v in arr.ravel():
+        if v != nodata:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _get_any_non_null_kernel():
+    """
+    JIT-compile the null scan with numba if it's installed. numba is optional and only
+    imported here, since the scan only runs when CHECK_NULL_RASTERS is enabled.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_any_non_null)
+
+
+def any_non_null(data: np.ndarray, nodata: Optional[float]) -> bool:
+    if nodata is None:
+        return data.size > 0
+    kernel = _get_any_non_null_kernel()
+    if kernel is None:
+        return bool(np.any(data != nodata))
+    return kernel(data, nodata)
+
+
+def raster_stats_all_null(dataset: rasterio.DatasetReader) -> Optional[bool]:
+    """
+    Use GDAL band statistics, if present, to decide whether the raster is all null.
+    Returns None if the statistics are unavailable or approximate.
+    """
+    tags = dataset.tags(1)
+    # approximate statistics come from overviews and can miss isolated wet cells
+    if tags.get('STATISTICS_APPROXIMATE') == 'YES':
+        return None
+    valid_percent = tags.get('STATISTICS_VALID_PERCENT')
+    if valid_percent is None:
+        return None
+    try:
+        return float(valid_percent) == 0
+    except ValueError:
+        return None
+
+
+def raster_overview_has_data(dataset: rasterio.DatasetReader) -> bool:
+    """
+    Read the smallest overview (if any) and check it for non-null cells.
+    An all-null overview doesn't prove the full-resolution raster is null.
+    """
+    overviews = dataset.overviews(1)
+    if not overviews:
+        return False
+    factor = overviews[-1]
+    out_shape = (max(1, dataset.height // factor), max(1, dataset.width // factor))
+    data = dataset.read(1, out_shape=out_shape)
+    return any_non_null(data, dataset.nodata)
+
+
+@etag_cached
 def raster_is_all_null(s3_key: str) -> bool:
     """
     Opens a GeoTIFF file from an S3 URL using Rasterio.
@@ -426,22 +757,29 @@ def raster_is_all_null(s3_key: str) -> bool:
     """
     s3_path = f"s3://{BUCKET_NAME}/{s3_key}"
     # Open the GeoTIFF file from S3
-    with rasterio.Env(AWS_SESSION):
+    with rasterio.Env(get_aws_session()):
         with rasterio.open(s3_path) as dataset:
+            # Cheapest checks first: band statistics, then the smallest overview
+            all_null = raster_stats_all_null(dataset)
+            if all_null is not None:
+                return all_null
+            if raster_overview_has_data(dataset):
+                return False
+
             # Iterate over windows (chunks) of the dataset
             for ji, window in dataset.block_windows(1):
                 # Read the data in the current window
                 data = dataset.read(window=window)
 
                 # Check if there are any non-null cells
-                if np.any(data != dataset.nodata):
+                if any_non_null(data, dataset.nodata):
                     return False
     return True
 
 
 def get_raster_metadata(s3_key: str) -> dict:
     s3_path = f"s3://{BUCKET_NAME}/{s3_key}"
-    with rasterio.Env(AWS_SESSION):
+    with rasterio.Env(get_aws_session()):
         with rasterio.open(s3_path) as src:
             return src.tags(1)
 
@@ -473,36 +811,71 @@ def to_snake_case(text):
     return text.lower()
 
 
-def convert_hdf5_string(value: str):
-    ras_datetime_format1_re = r"\d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2}"
-    ras_datetime_format2_re = r"\d{2}\w{3}\d{4} \d{2}\d{2}"
-    s = value.decode('utf-8')
+RAS_DATETIME_FORMAT = '%d%b%Y %H:%M:%S'
+RAS_SIMULATION_WINDOW_DATETIME_FORMAT = '%d%b%Y %H%M'
+RAS_DATETIME_FORMAT1_RE = re.compile(r"^\d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2}(?: to \d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2})?$")
+RAS_DATETIME_FORMAT2_RE = re.compile(r"^\d{2}\w{3}\d{4} \d{4}(?: to \d{2}\w{3}\d{4} \d{4})?$")
+
+
+@functools.lru_cache(maxsize=1024)
+def ras_datetime_isoformat(datetime_str: str, format: str) -> str:
+    # the same time window strings recur across every plan file
+    return datetime.strptime(datetime_str, format).isoformat()
+
+
+def convert_ras_datetime_string(s: str, format: str):
+    if " to " in s:
+        begin, end = s.split(" to ")
+        return [
+            ras_datetime_isoformat(begin, format),
+            ras_datetime_isoformat(end, format),
+        ]
+    return ras_datetime_isoformat(s, format)
+
+
+def convert_ras_string(s: str):
     if s == "True":
         return True
     elif s == "False":
         return False
-    elif re.match(rf"^{ras_datetime_format1_re}", s):
-        if re.match(rf"^{ras_datetime_format1_re} to {ras_datetime_format1_re}$", s):
-            split = s.split(" to ")
-            return [
-                parse_ras_datetime(split[0]).isoformat(),
-                parse_ras_datetime(split[1]).isoformat(),
-            ]
-        return parse_ras_datetime(s).isoformat()
-    elif re.match(rf"^{ras_datetime_format2_re}", s):
-        if re.match(rf"^{ras_datetime_format2_re} to {ras_datetime_format2_re}$", s):
-            split = s.split(" to ")
-            return [
-                parse_ras_simulation_window_datetime(split[0]).isoformat(),
-                parse_ras_simulation_window_datetime(split[1]).isoformat(),
-            ]
-        return parse_ras_simulation_window_datetime(s).isoformat()
-    return s 
+    elif RAS_DATETIME_FORMAT1_RE.match(s):
+        return convert_ras_datetime_string(s, RAS_DATETIME_FORMAT)
+    elif RAS_DATETIME_FORMAT2_RE.match(s):
+        return convert_ras_datetime_string(s, RAS_SIMULATION_WINDOW_DATETIME_FORMAT)
+    return s
+
+
+def convert_hdf5_string(value: bytes):
+    return convert_ras_string(value.decode('utf-8'))
+
+
+def convert_hdf5_array(value: np.ndarray) -> Optional[list]:
+    """
+    Convert a 1-D numeric or byte string array in one shot.
+    Returns None for arrays that need element-wise handling.
+    """
+    kind = value.dtype.kind
+    if kind in 'iu':
+        return value.tolist()
+    elif kind == 'f':
+        converted = value.tolist()
+        for i in np.flatnonzero(np.isnan(value)):
+            converted[i] = None
+        return converted
+    elif kind == 'S':
+        return [convert_ras_string(s) for s in np.char.decode(value, 'utf-8').tolist()]
+    return None
 
 
 def convert_hdf5_value(value):
     # TODO (?): handle "8-bit bitfield" values in 2D Flow Area groups
 
+    # Convert numeric and byte string arrays without a Python call per element
+    if isinstance(value, np.ndarray) and value.ndim == 1 and value.size > 1:
+        converted = convert_hdf5_array(value)
+        if converted is not None:
+            return converted
+
     # Check for NaN (np.nan)
     if isinstance(value, np.floating) and np.isnan(value):
         return None
@@ -577,11 +950,22 @@ def parse_duration(duration_str: str) -> timedelta:
     return duration
 
 
-def geom_to_4326(s: shapely.Geometry, proj_wkt: str) -> shapely.Geometry:
+@functools.lru_cache(maxsize=8)
+def get_4326_transformer(proj_wkt: str) -> pyproj.Transformer:
     source_crs = pyproj.CRS.from_wkt(proj_wkt)
     target_crs = pyproj.CRS.from_epsg(4326)
-    transformer = pyproj.Transformer.from_proj(source_crs, target_crs, always_xy=True)
-    return shapely.ops.transform(transformer.transform, s)
+    return pyproj.Transformer.from_proj(source_crs, target_crs, always_xy=True)
+
+
+def geom_to_4326(s: shapely.Geometry, proj_wkt: str) -> shapely.Geometry:
+    transformer = get_4326_transformer(proj_wkt)
+
+    def transform_coords(coords: np.ndarray) -> np.ndarray:
+        # one pyproj call for every vertex rather than one per coordinate pair
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+
+    return shapely.transform(s, transform_coords)
 
 
 def ras_geom_extents(extents, proj_wkt: str) -> shapely.Polygon:
@@ -601,10 +985,23 @@ def ras_geom_extents(extents, proj_wkt: str) -> shapely.Polygon:
     return extents_transformed
 
 
-def open_s3_hdf5(s3_hdf5_key: str) -> h5py.File:
+HDF5_BLOCK_SIZE = 1 << 20
+
+
+@contextmanager
+def open_s3_hdf5(s3_hdf5_key: str) -> Iterator[h5py.File]:
     s3url = f"s3://{BUCKET_NAME}/{s3_hdf5_key}"
-    s3f = fsspec.open(s3url, mode='rb')
-    return h5py.File(s3f.open(), mode='r')
+    # block cache so that neighbouring attribute/metadata reads don't each cost a range request
+    s3f = fsspec.open(
+        s3url,
+        mode='rb',
+        default_cache_type='blockcache',
+        default_block_size=HDF5_BLOCK_SIZE,
+        config_kwargs={'max_pool_connections': S3_MAX_POOL_CONNECTIONS, 'retries': S3_RETRIES},
+    )
+    with s3f as f:
+        with h5py.File(f, mode='r') as h5f:
+            yield h5f
 
 
 def get_first_group(parent_group: h5py.Group) -> Optional[h5py.Group]:
@@ -614,9 +1011,13 @@ def get_first_group(parent_group: h5py.Group) -> Optional[h5py.Group]:
     return None
 
 
-def get_geom_attrs(model_g01_key: str) -> dict:
-    h5f = open_s3_hdf5(model_g01_key)    
+@etag_cached
+def get_geom_attrs_and_perimeter(model_g01_key: str) -> Tuple[dict, Optional[shapely.Polygon]]:
+    with open_s3_hdf5(model_g01_key) as h5f:
+        return read_geom_attrs(h5f), read_2d_flow_area_perimeter(h5f)
+
 
+def read_geom_attrs(h5f: h5py.File) -> dict:
     attrs = {}
     top_attrs = hdf5_attrs_to_dict(h5f.attrs)
     projection = top_attrs.pop("projection", None)
@@ -642,9 +1043,23 @@ def get_geom_attrs(model_g01_key: str) -> dict:
     return attrs
 
 
+@etag_cached
 def get_plan_attrs(model_p01_key: str, results: bool = True) -> dict:
-    h5f = open_s3_hdf5(model_p01_key)    
+    with open_s3_hdf5(model_p01_key) as h5f:
+        attrs = read_plan_attrs(h5f)
+        if results:
+            plan_results_attrs = read_plan_results_attrs(h5f)
+            attrs.update(plan_results_attrs)
+    return attrs
+
 
+@etag_cached
+def get_plan_and_results_attrs(model_p01_key: str) -> Tuple[dict, dict]:
+    with open_s3_hdf5(model_p01_key) as h5f:
+        return read_plan_attrs(h5f), read_plan_results_attrs(h5f)
+
+
+def read_plan_attrs(h5f: h5py.File) -> dict:
     attrs = {}
     top_attrs = hdf5_attrs_to_dict(h5f.attrs)
     projection = top_attrs.pop("projection", None)
@@ -666,16 +1081,16 @@ def get_plan_attrs(model_p01_key: str, results: bool = True) -> dict:
     precip_attrs = hdf5_attrs_to_dict(precip.attrs, prefix="Meteorology")
     precip_attrs.pop("meteorology:projection", None)
     attrs.update(precip_attrs)
-
-    if results:
-        plan_results_attrs = get_plan_results_attrs(model_p01_key, h5f=h5f)
-        attrs.update(plan_results_attrs)
     return attrs
 
 
-def get_plan_results_attrs(model_p01_key: str, h5f: Optional[h5py.File] = None) -> dict:
-    if not h5f:
-        h5f = open_s3_hdf5(model_p01_key)
+@etag_cached
+def get_plan_results_attrs(model_p01_key: str) -> dict:
+    with open_s3_hdf5(model_p01_key) as h5f:
+        return read_plan_results_attrs(h5f)
+
+
+def read_plan_results_attrs(h5f: h5py.File) -> dict:
     results_attrs = {}
 
     unsteady_results = h5f['Results']['Unsteady']
@@ -701,20 +1116,31 @@ def get_plan_results_attrs(model_p01_key: str, h5f: Optional[h5py.File] = None)
     return results_attrs
 
 
+def _hashable_items(d: dict) -> Iterator[Tuple[str, object]]:
+    for k, v in d.items():
+        # list values (e.g. time windows) are compared as tuples
+        yield k, tuple(v) if isinstance(v, list) else v
+
+
 def asset_extra_fields_intersection(item: pystac.Item) -> dict:
     extra_fields_to_intersect = []
     for key, asset in item.assets.items():
         # if key.endswith('.p01.hdf'):
         if asset.media_type == pystac.MediaType.HDF5 and asset.has_role('ras-output'):
             extra_fields_to_intersect.append(asset.extra_fields)
-    intersection = extra_fields_to_intersect[0].copy()
-    # print(intersection)
-    for d in extra_fields_to_intersect[1:]:
-        # print(d)
-        # print(d.items() & intersection.items())
-        # intersection = dict(d.items() & intersection.items())
-        intersection = {k: v for k, v in intersection.items() if k in d and d[k] == v}
-    return intersection
+    first = extra_fields_to_intersect[0]
+    try:
+        common_items = frozenset(_hashable_items(first))
+        for d in extra_fields_to_intersect[1:]:
+            common_items &= frozenset(_hashable_items(d))
+    except TypeError:
+        # unhashable values (e.g. nested dicts); compare key by key instead
+        intersection = first.copy()
+        for d in extra_fields_to_intersect[1:]:
+            intersection = {k: v for k, v in intersection.items() if k in d and d[k] == v}
+        return intersection
+    common_keys = {k for k, _ in common_items}
+    return {k: v for k, v in first.items() if k in common_keys}
 
 
 def drop_common_fields(extra_fields: dict, common: dict) -> dict:
@@ -734,16 +1160,41 @@ def dedupe_asset_metadata(item: pystac.Item):
             item.assets[k].extra_fields = deduped_extra_fields
 
 
+PERIMETER_SIMPLIFY_TOLERANCE_M = 10.0
+PERIMETER_SIMPLIFY_TOLERANCE_DEG = 1e-4
+
+
+def get_perimeter_simplify_tolerance(proj_wkt: str) -> float:
+    """
+    Perimeter simplification tolerance expressed in the units of the given CRS.
+    """
+    crs = pyproj.CRS.from_wkt(proj_wkt)
+    if crs.is_geographic:
+        return PERIMETER_SIMPLIFY_TOLERANCE_DEG
+    # conversion factor is meters per CRS unit (e.g. 0.3048 for feet)
+    meters_per_unit = crs.axis_info[0].unit_conversion_factor
+    return PERIMETER_SIMPLIFY_TOLERANCE_M / meters_per_unit
+
+
 def get_2d_flow_area_perimeter(model_g01_key) -> Optional[shapely.Polygon]:
-    h5f = open_s3_hdf5(model_g01_key)
+    with open_s3_hdf5(model_g01_key) as h5f:
+        return read_2d_flow_area_perimeter(h5f)
+
+
+def read_2d_flow_area_perimeter(h5f: h5py.File) -> Optional[shapely.Polygon]:
     projection = h5f.attrs['Projection'].decode()
     d2_flow_area = get_first_group(h5f['Geometry']['2D Flow Areas'])
     if not d2_flow_area:
         return None
     perim = d2_flow_area['Perimeter']
-    perim_coords = perim[:]
-    perim_polygon = shapely.Polygon(perim_coords).simplify(0.001)
-    return geom_to_4326(perim_polygon, projection)
+    perim_coords = np.ascontiguousarray(perim[...], dtype=np.float64)
+    perim_polygon = shapely.polygons(perim_coords)
+    # simplify in the model CRS so fewer vertices need reprojecting
+    tolerance = get_perimeter_simplify_tolerance(projection)
+    simplified = shapely.simplify(perim_polygon, tolerance, preserve_topology=False)
+    if simplified.is_empty or not simplified.is_valid:
+        simplified = shapely.simplify(perim_polygon, tolerance)
+    return geom_to_4326(simplified, projection)
 
 
 def get_datetime_from_item_assets(item: pystac.Item) -> datetime:
@@ -779,7 +1230,38 @@ def get_temporal_extent_from_collections(collections: List[pystac.Collection]) -
     return pystac.TemporalExtent(intervals=[dt_min, dt_max])
 
 
+def build_model(ras_model_key_base: str) -> Tuple[pystac.Collection, pystac.Collection, pystac.Item, pystac.Collection, list]:
+    logger.info(ras_model_key_base)
+    ras_model_collection, perimeter = create_ras_model_collection(ras_model_key_base)
+    bboxes = ras_model_collection.extent.spatial.bboxes
+
+    logger.info(f"Creating realization collection: {ras_model_key_base}")
+    realization_collection = create_ras_model_realization_collection(ras_model_key_base, 1)
+    realization_collection.extent = ras_model_collection.extent
+    ras_model_collection.add_child(realization_collection)
+
+    r = 1
+    logger.info(f"Creating realization item: r={r} {ras_model_key_base}")
+    item = create_realization_ras_results_item(ras_model_key_base, r, perimeter)
+    # item.properties = asset_extra_fields_intersection(item)
+    logger.info(f"Setting item datetime based on assets: {ras_model_key_base}")
+    item.datetime = get_datetime_from_item_assets(item)
+    logger.info(f"Adding item to realization collection: {ras_model_key_base}")
+    realization_collection.add_item(item)
+    # dedupe_asset_metadata(item)
+
+    logger.info(f"Setting temporal extent based on item assets: {ras_model_key_base}")
+    realization_collection.extent.temporal = get_temporal_extent_from_item_assets(item)
+
+    logger.info(f"Creating depth grids collection: {ras_model_key_base}")
+    depth_grids_collection = create_depth_grids_collection(ras_model_key_base, 1)
+    logger.info(f"Adding depth grids collection to realization collection: {ras_model_key_base}")
+    realization_collection.add_child(depth_grids_collection)
+    return ras_model_collection, realization_collection, item, depth_grids_collection, bboxes
+
+
 def main():
+    global _hdf_executor
     t1 = datetime.now()
     stac_path = Path('./stac')
     if stac_path.exists():
@@ -791,34 +1273,21 @@ def main():
     ras_model_bboxes = []
 
     ras_model_names = list_ras_model_names()
-    for _, ras_model_key_base in enumerate(ras_model_names):
-        logger.info(ras_model_key_base)
-        ras_model_collection = create_ras_model_collection(ras_model_key_base)
-        ras_model_bboxes.extend(ras_model_collection.extent.spatial.bboxes)
+    # models are independent, so build them concurrently; listing and raster reads overlap
+    # across the model threads, while HDF5 reads are handed off to the process pool
+    hdf_mp_context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=HDF_WORKERS, mp_context=hdf_mp_context) as hdf_executor:
+        _hdf_executor = hdf_executor
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                results = list(executor.map(build_model, ras_model_names))
+        finally:
+            _hdf_executor = None
+
+    # stitch into the parent collection on the main thread, preserving model order
+    for ras_model_collection, _, _, _, bboxes in results:
+        ras_model_bboxes.extend(bboxes)
         ras_models_parent_collection.add_child(ras_model_collection)
-
-        logger.info(f"Creating realization collection: {ras_model_key_base}")
-        realization_collection = create_ras_model_realization_collection(ras_model_key_base, 1)
-        realization_collection.extent = ras_model_collection.extent
-        ras_model_collection.add_child(realization_collection)
-
-        r = 1
-        logger.info(f"Creating realization item: r={r} {ras_model_key_base}")
-        item = create_realization_ras_results_item(ras_model_key_base, r)
-        # item.properties = asset_extra_fields_intersection(item)
-        logger.info("Setting item datetime based on assets")
-        item.datetime = get_datetime_from_item_assets(item)
-        logger.info("Adding item to realization collection")
-        realization_collection.add_item(item)
-        # dedupe_asset_metadata(item)
-
-        logger.info("Settings temporal extent based on item assets")
-        realization_collection.extent.temporal = get_temporal_extent_from_item_assets(item)
-
-        logger.info("Creating depth grids collection")
-        depth_grids_collection = create_depth_grids_collection(ras_model_key_base, 1)
-        logger.info("Adding depth grids collection to realization collection")
-        realization_collection.add_child(depth_grids_collection)
     
     spatial_extent = pystac.SpatialExtent(ras_model_bboxes)
     # temporal_extent = pystac.TemporalExtent(intervals=[datetime.now(), datetime.now()])
@@ -828,6 +1297,7 @@ def main():
     logger.info("Adding ras models collection to parent catalog")
     catalog.add_child(ras_models_parent_collection)
     logger.info("Saving catalog")
+    pystac.StacIO.set_default(SortedOrjsonStacIO)
     catalog.normalize_and_save(root_href=ROOT_HREF, catalog_type=pystac.CatalogType.SELF_CONTAINED)
     logger.info("Done.")
     t2 = datetime.now()
@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import functools
 import re
 from typing import Any, Optional, Tuple
 import warnings
@@ -8,7 +9,6 @@ import h5py
 import numpy as np
 import pyproj
 import shapely
-import shapely.ops
 
 
 def to_snake_case(text):
@@ -66,36 +66,71 @@ def parse_duration(duration_str: str) -> timedelta:
     return duration
 
 
-def convert_hdf5_string(value: str):
-    ras_datetime_format1_re = r"\d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2}"
-    ras_datetime_format2_re = r"\d{2}\w{3}\d{4} \d{2}\d{2}"
-    s = value.decode('utf-8')
+RAS_DATETIME_FORMAT = '%d%b%Y %H:%M:%S'
+RAS_SIMULATION_WINDOW_DATETIME_FORMAT = '%d%b%Y %H%M'
+RAS_DATETIME_FORMAT1_RE = re.compile(r"^\d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2}(?: to \d{2}\w{3}\d{4} \d{2}:\d{2}:\d{2})?$")
+RAS_DATETIME_FORMAT2_RE = re.compile(r"^\d{2}\w{3}\d{4} \d{4}(?: to \d{2}\w{3}\d{4} \d{4})?$")
+
+
+@functools.lru_cache(maxsize=1024)
+def ras_datetime_isoformat(datetime_str: str, format: str) -> str:
+    # the same time window strings recur across every plan file
+    return datetime.strptime(datetime_str, format).isoformat()
+
+
+def convert_ras_datetime_string(s: str, format: str):
+    if " to " in s:
+        begin, end = s.split(" to ")
+        return [
+            ras_datetime_isoformat(begin, format),
+            ras_datetime_isoformat(end, format),
+        ]
+    return ras_datetime_isoformat(s, format)
+
+
+def convert_ras_string(s: str):
     if s == "True":
         return True
     elif s == "False":
         return False
-    elif re.match(rf"^{ras_datetime_format1_re}", s):
-        if re.match(rf"^{ras_datetime_format1_re} to {ras_datetime_format1_re}$", s):
-            split = s.split(" to ")
-            return [
-                parse_ras_datetime(split[0]).isoformat(),
-                parse_ras_datetime(split[1]).isoformat(),
-            ]
-        return parse_ras_datetime(s).isoformat()
-    elif re.match(rf"^{ras_datetime_format2_re}", s):
-        if re.match(rf"^{ras_datetime_format2_re} to {ras_datetime_format2_re}$", s):
-            split = s.split(" to ")
-            return [
-                parse_ras_simulation_window_datetime(split[0]).isoformat(),
-                parse_ras_simulation_window_datetime(split[1]).isoformat(),
-            ]
-        return parse_ras_simulation_window_datetime(s).isoformat()
-    return s 
+    elif RAS_DATETIME_FORMAT1_RE.match(s):
+        return convert_ras_datetime_string(s, RAS_DATETIME_FORMAT)
+    elif RAS_DATETIME_FORMAT2_RE.match(s):
+        return convert_ras_datetime_string(s, RAS_SIMULATION_WINDOW_DATETIME_FORMAT)
+    return s
+
+
+def convert_hdf5_string(value: bytes):
+    return convert_ras_string(value.decode('utf-8'))
+
+
+def convert_hdf5_array(value: np.ndarray) -> Optional[list]:
+    """
+    Convert a 1-D numeric or byte string array in one shot.
+    Returns None for arrays that need element-wise handling.
+    """
+    kind = value.dtype.kind
+    if kind in 'iu':
+        return value.tolist()
+    elif kind == 'f':
+        converted = value.tolist()
+        for i in np.flatnonzero(np.isnan(value)):
+            converted[i] = None
+        return converted
+    elif kind == 'S':
+        return [convert_ras_string(s) for s in np.char.decode(value, 'utf-8').tolist()]
+    return None
 
 
 def convert_hdf5_value(value):
     # TODO (?): handle "8-bit bitfield" values in 2D Flow Area groups
 
+    # Convert numeric and byte string arrays without a Python call per element
+    if isinstance(value, np.ndarray) and value.ndim == 1 and value.size > 1:
+        converted = convert_hdf5_array(value)
+        if converted is not None:
+            return converted
+
     # Check for NaN (np.nan)
     if isinstance(value, np.floating) and np.isnan(value):
         return None
@@ -144,11 +179,22 @@ def get_first_hdf_group(parent_group: h5py.Group) -> Optional[h5py.Group]:
     return None
 
 
-def geom_to_4326(s: shapely.Geometry, proj_wkt: str) -> shapely.Geometry:
+@functools.lru_cache(maxsize=8)
+def get_4326_transformer(proj_wkt: str) -> pyproj.Transformer:
     source_crs = pyproj.CRS.from_wkt(proj_wkt)
     target_crs = pyproj.CRS.from_epsg(4326)
-    transformer = pyproj.Transformer.from_proj(source_crs, target_crs, always_xy=True)
-    return shapely.ops.transform(transformer.transform, s)
+    return pyproj.Transformer.from_proj(source_crs, target_crs, always_xy=True)
+
+
+def geom_to_4326(s: shapely.Geometry, proj_wkt: str) -> shapely.Geometry:
+    transformer = get_4326_transformer(proj_wkt)
+
+    def transform_coords(coords: np.ndarray) -> np.ndarray:
+        # one pyproj call for every vertex rather than one per coordinate pair
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+
+    return shapely.transform(s, transform_coords)
 
 
 class RasHdf(h5py.File):
@@ -158,7 +204,7 @@ class RasHdf(h5py.File):
 
     @classmethod
     def open_url(cls, url: str, mode: str = "r", **kwargs):
-        s3f = fsspec.open(url, mode="rb")
+        s3f = fsspec.open(url, mode="rb", default_cache_type="blockcache", default_block_size=1 << 20)
         return cls(s3f.open(), mode, **kwargs)
 
     def get_attrs(self):
@@ -268,10 +314,10 @@ class RasGeomHdf(RasHdf):
         perim = d2_flow_area.get('Perimeter')
         if perim is None:
             return None
-        perim_coords = perim[:]
-        perim_polygon = shapely.Polygon(perim_coords)
+        perim_coords = np.ascontiguousarray(perim[...], dtype=np.float64)
+        perim_polygon = shapely.polygons(perim_coords)
         if simplify is not None:
-            perim_polygon = perim_polygon.simplify(simplify)
+            perim_polygon = shapely.simplify(perim_polygon, simplify)
         if wgs84:
             proj_wkt = self.get_projection()
             if proj_wkt is not None:
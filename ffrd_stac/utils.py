@@ -1,27 +1,33 @@
 import fsspec
-from mypy_boto3_s3.service_resource import Bucket, Object
+from mypy_boto3_s3.service_resource import Bucket, ObjectSummary
 from ffrd_stac.rasmeta import RasGeomHdf, RasPlanHdf
 
 import copy
+import functools
 import re
 from typing import Any, List
 
 
-def filter_objects(bucket: Bucket, pattern: str = None, prefix: str = None) -> List[Object]:
-    compiled_pattern = re.compile(pattern) if pattern else None
+@functools.lru_cache(maxsize=None)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+def filter_objects(bucket: Bucket, pattern: str = None, prefix: str = None, suffix: str = None) -> List[ObjectSummary]:
+    compiled_pattern = _compile_pattern(pattern) if pattern else None
     objects = []
-    for obj in bucket.objects.filter(Prefix=prefix):
-        if compiled_pattern:
-            if re.match(compiled_pattern, obj.key):
-                objects.append(obj)
-        else:
-            objects.append(obj)
+    # the collection pages through list_objects_v2 under the hood; ask for full pages
+    for obj in bucket.objects.filter(Prefix=prefix or "").page_size(1000):
+        if suffix and not obj.key.endswith(suffix):
+            continue
+        if compiled_pattern and not compiled_pattern.match(obj.key):
+            continue
+        objects.append(obj)
     return objects
 
 
 def list_ras_model_names(bucket: Bucket, prefix: str) -> list:
-    plan_hdfs_pattern = r".*\.p01\.hdf$"
-    ras_plan_hdfs = list(filter_objects(bucket, prefix=prefix, pattern=plan_hdfs_pattern))
+    ras_plan_hdfs = filter_objects(bucket, prefix=prefix, suffix=".p01.hdf")
     return [hdf.key[:-8].split("/")[-1] for hdf in ras_plan_hdfs]
 
 